@@ -0,0 +1,3 @@
+from venvdir.main import cli
+
+cli(prog_name="venvdir")
@@ -1,5 +1,4 @@
 import os
-from configparser import ConfigParser
 
 from venvdir.error import VenvDirBaseError
 from venvdir.util import get_user_project_path
@@ -7,10 +6,10 @@ from venvdir.util import get_default_venvs_path
 
 
 class VenvsConfigParser:
-    def __init__(self, parser):
+    def __init__(self, parser, path=None):
         self.parser = parser
         file_name = "entries.cfg"
-        self.path = os.path.join(get_user_project_path(), file_name)
+        self.path = path or os.path.join(get_user_project_path(), file_name)
         if not os.path.exists(self.path):
             self._save()
         else:
@@ -42,5 +41,3 @@ class VenvsConfigParser:
         with open(self.path, "w+", encoding="utf-8") as file:
             self.parser.write(file)
 
-
-config_parser = VenvsConfigParser(ConfigParser())
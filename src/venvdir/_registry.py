@@ -0,0 +1,364 @@
+import heapq
+import json
+import os
+import struct
+from contextlib import contextmanager
+from configparser import ConfigParser
+from operator import itemgetter
+
+from venvdir.error import VenvDirBaseError
+from venvdir._configparser import VenvsConfigParser
+from venvdir._shellcache import ShellPathCache
+from venvdir.util import file_lock
+from venvdir.util import get_default_venvs_path
+from venvdir.util import get_user_project_path
+
+_DB_FILE_NAME = "entries.db"
+_JOURNAL_FILE_NAME = "entries.journal.{}"
+_LEGACY_FILE_NAME = "entries.cfg"
+_LOCK_FILE_NAME = "entries.lock"
+_MAGIC = b"VENVDIR1"
+_HEADER = struct.Struct(">8sQQQ")
+_OFFSET = struct.Struct(">Q")
+_COMPACT_THRESHOLD = 512
+
+
+def _encode_record(name, entry):
+    return (json.dumps([name, entry], sort_keys=True) + "\n").encode("utf-8")
+
+
+def _decode_record(line):
+    name, entry = json.loads(line.decode("utf-8"))
+    return name, entry
+
+
+class JournaledRegistry:
+    """Stores entries as a sorted, indexed snapshot plus an append-only journal.
+
+    The snapshot (``entries.db``) is a fixed header, one JSON record per line sorted
+    by name and a table of record offsets, so a single entry is found with a binary
+    search instead of parsing the whole file. Mutations append one line to the
+    journal of the current snapshot generation. Once the journal holds more than
+    ``compact_threshold`` records it is folded into a new snapshot generation.
+
+    Every mutation is mirrored into a :class:`ShellPathCache` so ``venvdira`` can
+    resolve paths without starting Python.
+
+    Nothing is read until the first access. After that, each access compares the
+    modification time and size of the snapshot and journal against the last load
+    and only re-reads what changed, so other processes' writes are picked up.
+
+    Several processes may write at once. Each commit takes an exclusive lock on
+    ``entries.lock``, catches up with the files on disk, checks its changes against
+    that state and appends them, so no update is lost. Snapshots are replaced with
+    an atomic rename and readers never take the lock.
+    """
+
+    def __init__(self, directory, compact_threshold=_COMPACT_THRESHOLD):
+        self.directory = directory
+        self.compact_threshold = compact_threshold
+        self.db_path = os.path.join(directory, _DB_FILE_NAME)
+        self.lock_path = os.path.join(directory, _LOCK_FILE_NAME)
+        self.path_cache = ShellPathCache(directory)
+        self._loaded = False
+        self._cached_depth = 0
+        self._lock_depth = 0
+        self._db_signature = None
+        self._generation = 0
+        self._journal = {}
+        self._journal_size = 0
+        self._journal_offset = 0
+        self._lookups = {}
+
+    @property
+    def entries(self):
+        return [name for name, _ in self.iter_entries()]
+
+    @contextmanager
+    def cached(self):
+        """Serves every read inside the block from memory without checking the disk.
+
+        Use this to run many lookups in a row; changes made by other processes
+        during the block are seen on the first access after it.
+        """
+        self._validate()
+        self._cached_depth += 1
+        try:
+            yield self
+        finally:
+            self._cached_depth -= 1
+
+    def invalidate(self):
+        """Drops everything held in memory so the next access reloads from disk."""
+        self._loaded = False
+        self._db_signature = None
+        self._journal = {}
+        self._journal_size = 0
+        self._journal_offset = 0
+        self._lookups = {}
+
+    def iter_entries(self):
+        """Yields ``(name, entry)`` pairs sorted by name."""
+        self._validate()
+        overlay = sorted(
+            (name, entry) for name, entry in self._journal.items() if entry is not None
+        )
+        snapshot = (
+            (name, entry)
+            for name, entry in self._iter_snapshot()
+            if name not in self._journal
+        )
+        for name, entry in heapq.merge(snapshot, overlay, key=itemgetter(0)):
+            yield name, dict(entry)
+
+    def __contains__(self, name):
+        self._validate()
+        return self._find(name) is not None
+
+    def get_entry(self, name):
+        self._validate()
+        entry = self._find(name)
+        if entry is None:
+            raise VenvDirBaseError("Entry '{}' does not exist.".format(name))
+        return dict(entry)
+
+    def create_entry(self, name, path=None):
+        self.create_entries([(name, path)])
+
+    def create_entries(self, items):
+        """Registers every ``(name, base_path)`` pair with a single journal write."""
+        items = [(name, path or get_default_venvs_path()) for name, path in items]
+
+        def build_records():
+            records = []
+            names = set()
+            for name, path in items:
+                if name in names or self._find(name) is not None:
+                    raise VenvDirBaseError("Entry '{}' already exists.".format(name))
+                names.add(name)
+                entry = {"path": os.path.join(path, name)}
+                records.append({"op": "set", "name": name, "entry": entry})
+            return records
+
+        self._commit(build_records)
+
+    def remove_entry(self, name):
+        self._commit(lambda: [{"op": "del", "name": name}])
+
+    def compact(self):
+        """Folds the journal into a new snapshot generation."""
+        with self._lock():
+            self._validate(force=True)
+            self._compact()
+
+    @contextmanager
+    def _lock(self):
+        if self._lock_depth:
+            self._lock_depth += 1
+            try:
+                yield
+            finally:
+                self._lock_depth -= 1
+            return
+
+        os.makedirs(self.directory, exist_ok=True)
+        with file_lock(self.lock_path):
+            self._lock_depth = 1
+            try:
+                yield
+            finally:
+                self._lock_depth = 0
+
+    def _commit(self, build_records):
+        """Appends the records returned by ``build_records`` while holding the lock.
+
+        ``build_records`` runs after catching up with the files on disk, so its
+        checks see every change committed by other processes.
+        """
+        with self._lock():
+            self._validate(force=True)
+            records = build_records()
+            if not records:
+                return
+            self._append(*records)
+            if self._journal_size > self.compact_threshold:
+                self._compact()
+
+    def _compact(self):
+        old_journal_path = self._journal_path()
+        self._write_snapshot(self.iter_entries(), self._generation + 1)
+        if os.path.exists(old_journal_path):
+            os.remove(old_journal_path)
+        self.invalidate()
+
+    def _validate(self, force=False):
+        if not self._loaded:
+            self._load()
+            return
+        if self._cached_depth and not force:
+            return
+
+        if _get_signature(self.db_path) != self._db_signature:
+            self.invalidate()
+            self._load()
+            return
+
+        journal_signature = _get_signature(self._journal_path())
+        journal_size = journal_signature[1] if journal_signature else 0
+        if journal_size < self._journal_offset:
+            # The journal was truncated or replaced; start it over.
+            self._journal = {}
+            self._journal_size = 0
+            self._journal_offset = 0
+            self._read_journal()
+        elif journal_size > self._journal_offset:
+            self._read_journal()
+
+    def _find(self, name):
+        if name in self._journal:
+            return self._journal[name]
+        if name not in self._lookups:
+            self._lookups[name] = self._snapshot_lookup(name)
+        return self._lookups[name]
+
+    def _append(self, *records):
+        data = "".join(json.dumps(record, sort_keys=True) + "\n" for record in records)
+        fd = os.open(self._journal_path(), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, data.encode("utf-8"))
+        finally:
+            os.close(fd)
+        self._read_journal()
+        for record in records:
+            name = record["name"]
+            entry = record.get("entry")
+            if entry is None:
+                self.path_cache.remove(name)
+            else:
+                self.path_cache.write(name, entry["path"])
+
+    def _journal_path(self):
+        return os.path.join(self.directory, _JOURNAL_FILE_NAME.format(self._generation))
+
+    def _load(self):
+        if not os.path.exists(self.db_path):
+            with self._lock():
+                if not os.path.exists(self.db_path):
+                    self._import_legacy()
+
+        while True:
+            self.invalidate()
+            self._db_signature = _get_signature(self.db_path)
+            with open(self.db_path, "rb") as file:
+                self._generation, _, _ = self._read_header(file)
+            self._read_journal()
+            # A compaction between reading the snapshot and its journal deletes the
+            # journal, so read both again until the snapshot is stable.
+            if _get_signature(self.db_path) == self._db_signature:
+                break
+        self._loaded = True
+
+    @contextmanager
+    def _open_snapshot(self):
+        """Opens the snapshot of the loaded generation, reloading if it was replaced."""
+        while True:
+            with open(self.db_path, "rb") as file:
+                header = self._read_header(file)
+                if header[0] == self._generation:
+                    yield file, header
+                    return
+            self._load()
+
+    def _read_journal(self):
+        """Applies the journal records written since the last read."""
+        try:
+            with open(self._journal_path(), "rb") as file:
+                file.seek(self._journal_offset)
+                data = file.read()
+        except FileNotFoundError:
+            return
+
+        for line in data.splitlines(keepends=True):
+            # A line without a newline is a write that never finished.
+            if not line.endswith(b"\n"):
+                break
+            record = json.loads(line.decode("utf-8"))
+            self._journal[record["name"]] = record.get("entry")
+            self._journal_size += 1
+            self._journal_offset += len(line)
+
+    def _read_header(self, file):
+        magic, generation, count, index_offset = _HEADER.unpack(
+            file.read(_HEADER.size)
+        )
+        if magic != _MAGIC:
+            raise VenvDirBaseError("Registry '{}' is corrupt.".format(self.db_path))
+        return generation, count, index_offset
+
+    def _iter_snapshot(self):
+        with self._open_snapshot() as (file, header):
+            _, count, _ = header
+            for _ in range(count):
+                yield _decode_record(file.readline())
+
+    def _snapshot_lookup(self, name):
+        with self._open_snapshot() as (file, header):
+            _, count, index_offset = header
+            low, high = 0, count
+            while low < high:
+                middle = (low + high) // 2
+                file.seek(index_offset + middle * _OFFSET.size)
+                (offset,) = _OFFSET.unpack(file.read(_OFFSET.size))
+                file.seek(offset)
+                record_name, entry = _decode_record(file.readline())
+                if record_name == name:
+                    return entry
+                if record_name < name:
+                    low = middle + 1
+                else:
+                    high = middle
+        return None
+
+    def _write_snapshot(self, items, generation):
+        tmp_path = "{}.{}.tmp".format(self.db_path, os.getpid())
+        offsets = []
+        with open(tmp_path, "wb") as file:
+            file.write(_HEADER.pack(_MAGIC, generation, 0, 0))
+            for name, entry in items:
+                offsets.append(file.tell())
+                file.write(_encode_record(name, entry))
+            index_offset = file.tell()
+            file.write(b"".join(_OFFSET.pack(offset) for offset in offsets))
+            file.seek(0)
+            file.write(_HEADER.pack(_MAGIC, generation, len(offsets), index_offset))
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, self.db_path)
+
+    def _import_legacy(self):
+        legacy_path = os.path.join(self.directory, _LEGACY_FILE_NAME)
+        items = []
+        if os.path.exists(legacy_path):
+            legacy = VenvsConfigParser(ConfigParser(), path=legacy_path)
+            items = sorted((name, legacy.get_entry(name)) for name in legacy.entries)
+        self._write_snapshot(items, 0)
+        self.path_cache.rebuild(items)
+
+
+def _get_signature(path):
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+_registry = None
+
+
+def get_registry():
+    """Returns the process-wide registry for ``~/.venvdir``, creating it on first use."""
+    global _registry
+    if _registry is None:
+        _registry = JournaledRegistry(get_user_project_path())
+    return _registry
@@ -0,0 +1,42 @@
+import os
+import shutil
+
+from venvdir.util import atomic_write
+
+_PATHS_DIR_NAME = "paths"
+
+
+def _is_cacheable(name):
+    return bool(name) and "/" not in name and not name.startswith(".")
+
+
+class ShellPathCache:
+    """One file per entry holding its path, for ``venvdira`` to read without Python.
+
+    The file ``paths/<name>`` contains the environment path followed by a newline so
+    the shell can resolve it with a single ``read`` builtin.
+    """
+
+    def __init__(self, directory):
+        self.directory = os.path.join(directory, _PATHS_DIR_NAME)
+
+    def write(self, name, path):
+        if not _is_cacheable(name):
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        atomic_write(os.path.join(self.directory, name), path + "\n")
+
+    def remove(self, name):
+        if not _is_cacheable(name):
+            return
+        try:
+            os.remove(os.path.join(self.directory, name))
+        except FileNotFoundError:
+            pass
+
+    def rebuild(self, items):
+        """Replaces the whole cache with the given ``(name, entry)`` pairs."""
+        if os.path.isdir(self.directory):
+            shutil.rmtree(self.directory)
+        for name, entry in items:
+            self.write(name, entry["path"])
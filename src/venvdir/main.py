@@ -1,13 +1,27 @@
+from collections import OrderedDict
+from datetime import datetime
+
 import click
 
 from venvdir.error import _ErrorHandlingGroup
+from venvdir.error import VenvDirBaseError
+from venvdir.manifest import load_manifest
 from venvdir.venvs import add_entry
-from venvdir.venvs import get_entries
+from venvdir.venvs import iter_entries
 from venvdir.venvs import create_entry
+from venvdir.venvs import create_entries
 from venvdir.venvs import get_entry
 from venvdir.venvs import remove_entry
+from venvdir.pool import get_interpreter_key
+from venvdir.pool import get_pool
+from venvdir.stats import get_environment_stats
+from venvdir.stats import STAT_FIELDS
+from venvdir.trash import get_trash
 from venvdir.util import format_to_table
 from venvdir.util import find_format_width
+from venvdir.util import format_size
+from venvdir.util import iter_formatted_lines
+from venvdir.util import OUTPUT_FORMATS
 
 _CONTEXT_SETTINGS = {
     "help_option_names": ["-h", "--help"],
@@ -15,15 +29,94 @@ _CONTEXT_SETTINGS = {
 }
 
 
+_LIST_HEADER = OrderedDict(
+    [
+        ("name", "Name"),
+        ("path", "Path"),
+        ("size", "Size"),
+        ("python", "Python"),
+        ("mtime", "Modified"),
+    ]
+)
+
+
+def _get_sort_key(sort):
+    def key(row):
+        value = row.get(sort)
+        if sort == "python" and value:
+            value = tuple(int(p) if p.isdigit() else 0 for p in value.split("."))
+        # Missing values go last; sizes and times sort largest or newest first.
+        if value is None:
+            return (1, 0)
+        if sort in ("size", "mtime"):
+            return (0, -value)
+        return (0, value)
+
+    return key
+
+
+def _format_list_row(row):
+    formatted = dict(row)
+    if row.get("size") is not None:
+        formatted["size"] = format_size(row["size"])
+    if row.get("mtime") is not None:
+        formatted["mtime"] = datetime.fromtimestamp(row["mtime"]).strftime(
+            "%Y-%m-%d %H:%M"
+        )
+    return formatted
+
+
 @click.command(name="ls")
-def list_command():
+@click.option("--size", "show_size", is_flag=True, help="Show disk usage.")
+@click.option("--python", "show_python", is_flag=True, help="Show the Python version.")
+@click.option("--mtime", "show_mtime", is_flag=True, help="Show the last modification.")
+@click.option(
+    "--sort",
+    type=click.Choice(["name", "path", "size", "python", "mtime"]),
+    default="name",
+    help="Column to sort by. Size and mtime sort largest and newest first.",
+)
+@click.option(
+    "--format",
+    "-f",
+    "output_format",
+    type=click.Choice(OUTPUT_FORMATS),
+    default="table",
+    help="Output format. json, ndjson and tsv print raw sizes and timestamps.",
+)
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    help="Environments to scan at once. Defaults to a thread count based on the CPU count.",
+)
+def list_command(show_size, show_python, show_mtime, sort, output_format, jobs):
     """Lists all managed virtual environments."""
-    entries = get_entries()
-    if not entries:
-        return
-    rows, column_size = find_format_width(entries)
-    table = format_to_table(rows, column_size)
-    click.echo(table)
+    shown = [
+        field
+        for field, show in zip(STAT_FIELDS, (show_size, show_python, show_mtime))
+        if show
+    ]
+    rows = ({"name": entry.name, "path": entry.path} for entry in iter_entries())
+    fields = set(shown) | ({sort} & set(STAT_FIELDS))
+    if fields:
+        rows = list(rows)
+        stats = get_environment_stats().collect(
+            [row["path"] for row in rows], fields=fields, jobs=jobs
+        )
+        for row in rows:
+            row.update(stats[row["path"]])
+    if sort != "name":
+        rows = sorted(rows, key=_get_sort_key(sort))
+    if output_format == "table":
+        rows = (_format_list_row(row) for row in rows)
+    header = OrderedDict(
+        (key, value)
+        for key, value in _LIST_HEADER.items()
+        if key in ("name", "path") or key in shown
+    )
+    for line in iter_formatted_lines(rows, header, output_format):
+        click.echo(line)
 
 
 name_arg = click.argument("Name")
@@ -38,12 +131,46 @@ def _create_path_option(required):
     )
 
 
+def _echo_create_results(results):
+    failed = 0
+    for result in results:
+        if result.ok:
+            click.echo("Created '{}' in {:.2f}s.".format(result.name, result.seconds))
+        else:
+            failed += 1
+            click.echo("Failed '{}': {}".format(result.name, result.error), err=True)
+    if failed:
+        raise VenvDirBaseError(
+            "{} of {} environment(s) failed.".format(failed, len(results))
+        )
+
+
 @click.command()
-@name_arg
+@click.argument("Name", required=False)
 @_create_path_option(False)
-def create(name, path):
+@click.option(
+    "--from-manifest",
+    "manifest",
+    type=click.Path(exists=True, dir_okay=False),
+    help="Create every environment listed in a TOML, JSON or INI manifest.",
+)
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    help="Environments to create at once with --from-manifest. Defaults to the CPU count.",
+)
+def create(name, path, manifest, jobs):
     """Creates a new virtual environment."""
-    create_entry(name, path)
+    if bool(name) == bool(manifest):
+        raise click.UsageError("Provide either NAME or --from-manifest.")
+    if manifest:
+        items = load_manifest(manifest)
+        if path:
+            items = [(item_name, item_path or path) for item_name, item_path in items]
+        _echo_create_results(create_entries(items, jobs=jobs))
+    else:
+        create_entry(name, path)
 
 
 @click.command()
@@ -61,6 +188,20 @@ def remove(name):
     remove_entry(name)
 
 
+@click.command()
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    help="Trees to delete at once. Defaults to a thread count based on the CPU count.",
+)
+def purge(jobs):
+    """Deletes environments left in the trash by `rm`."""
+    purged = get_trash().purge(jobs=jobs)
+    if purged is None:
+        click.echo("Another purge is already running.")
+
+
 @click.command()
 @name_arg
 def which(name):
@@ -69,6 +210,76 @@ def which(name):
     click.echo(entry.path)
 
 
+@click.group(name="pool")
+def pool_group():
+    """Manages the pool of pre-built environments used by `create`."""
+    pass
+
+
+def _parse_target(ctx, param, value):
+    targets = {}
+    for item in value:
+        key, sep, target = item.rpartition("=")
+        if not sep or not key or not target.isdigit():
+            raise click.BadParameter("Expected KEY=N, got '{}'.".format(item))
+        targets[key] = int(target)
+    return targets
+
+
+@click.command(name="config")
+@click.option("--size", type=click.IntRange(min=0), help="Default target per interpreter.")
+@click.option(
+    "--target",
+    multiple=True,
+    callback=_parse_target,
+    help="Per-interpreter target as KEY=N, see `venvdir pool status` for keys.",
+)
+@click.option("--refill/--no-refill", default=None, help="Refill after each claim.")
+def pool_config(size, target, refill):
+    """Configures pool sizes."""
+    get_pool().configure(size=size, refill=refill, targets=target)
+
+
+@click.command(name="fill")
+@click.option("--python", "executable", help="Interpreter to build environments for.")
+@click.option("--background", is_flag=True, help="Fill in a detached process.")
+def pool_fill(executable, background):
+    """Builds environments until the pool reaches its target."""
+    pool = get_pool()
+    if background:
+        pool.fill_in_background()
+        return
+    built = pool.fill(executable)
+    if built is None:
+        click.echo("Another fill is already running.")
+    else:
+        key = get_interpreter_key(executable)
+        click.echo("Built {} environment(s) for {}.".format(built, key))
+
+
+@click.command(name="status")
+def pool_status():
+    """Shows targets, ready environments and hit/miss counts per interpreter."""
+    rows = get_pool().get_stats()
+    if not rows:
+        return
+    rows, column_size = find_format_width(rows)
+    click.echo(format_to_table(rows, column_size))
+
+
+@click.command(name="clear")
+def pool_clear():
+    """Deletes every pooled environment."""
+    removed = get_pool().clear()
+    click.echo("Removed {} environment(s).".format(removed))
+
+
+pool_group.add_command(pool_config)
+pool_group.add_command(pool_fill)
+pool_group.add_command(pool_status)
+pool_group.add_command(pool_clear)
+
+
 HELP = """\b
     Activate a virtual environment by doing:
     \n\tsource venvdira <env-name>
@@ -85,3 +296,5 @@ cli.add_command(create)
 cli.add_command(add)
 cli.add_command(which)
 cli.add_command(remove)
+cli.add_command(purge)
+cli.add_command(pool_group)
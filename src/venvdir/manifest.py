@@ -0,0 +1,71 @@
+import json
+from configparser import ConfigParser
+from configparser import Error as ConfigParserError
+from os import path
+
+from venvdir.error import VenvDirBaseError
+
+try:
+    import tomllib
+except ImportError:  # pragma: no cover
+    tomllib = None
+
+
+def _load_toml(manifest_path):
+    if tomllib is None:
+        raise VenvDirBaseError("TOML manifests require Python 3.11 or newer.")
+    with open(manifest_path, "rb") as file:
+        return tomllib.load(file).get("envs", {})
+
+
+def _load_json(manifest_path):
+    with open(manifest_path, encoding="utf-8") as file:
+        data = json.load(file)
+    return data.get("envs", {}) if isinstance(data, dict) else data
+
+
+def _load_ini(manifest_path):
+    parser = ConfigParser()
+    parser.read(manifest_path, encoding="utf-8")
+    return {name: dict(parser[name].items()) for name in parser.sections()}
+
+
+_LOADERS = {
+    ".toml": _load_toml,
+    ".json": _load_json,
+    ".ini": _load_ini,
+    ".cfg": _load_ini,
+}
+
+
+def load_manifest(manifest_path):
+    """Reads the environments to create from a TOML, JSON or INI manifest.
+
+    TOML and JSON manifests hold an ``envs`` table keyed by environment name, INI
+    manifests use one section per name. Each environment may set ``path``, the base
+    directory to create it in.
+
+    Returns:
+        list of tuple: ``(name, path)`` pairs, ``path`` being ``None`` when not set.
+    """
+    extension = path.splitext(manifest_path)[1].lower()
+    loader = _LOADERS.get(extension)
+    if loader is None:
+        raise VenvDirBaseError(
+            "Unsupported manifest '{}', expected one of {}.".format(
+                manifest_path, ", ".join(sorted(_LOADERS))
+            )
+        )
+    try:
+        envs = loader(manifest_path)
+    except (OSError, ValueError, ConfigParserError) as err:
+        raise VenvDirBaseError(
+            "Unable to read manifest '{}': {}".format(manifest_path, err)
+        )
+    if not isinstance(envs, dict) or not all(
+        isinstance(options, dict) for options in envs.values()
+    ):
+        raise VenvDirBaseError(
+            "Manifest '{}' must map environment names to options.".format(manifest_path)
+        )
+    return [(name, options.get("path")) for name, options in envs.items()]
@@ -0,0 +1,222 @@
+import errno
+import hashlib
+import os
+import shutil
+import subprocess
+import sys
+import uuid
+from configparser import ConfigParser
+from venv import create as create_venv
+
+from venvdir.util import file_lock
+from venvdir.util import get_user_project_path
+from venvdir.util import JsonCache
+from venvdir.util import relocate_environment
+
+_POOL_DIR_NAME = "pool"
+_CONFIG_FILE_NAME = "pool.cfg"
+_STATS_FILE_NAME = "stats.json"
+_FILL_LOCK_FILE_NAME = ".fill.lock"
+_POOL_SECTION = "pool"
+_INTERPRETER_SECTION = "interpreter:{}"
+
+
+def get_interpreter_key(executable=None):
+    """Names the pool of an interpreter, e.g. ``python3.8-1f2e3d4c``.
+
+    The hash of the resolved executable path keeps two installs of the same
+    version from sharing environments whose ``home`` points elsewhere.
+    """
+    executable = os.path.realpath(executable or sys.executable)
+    digest = hashlib.sha1(executable.encode("utf-8")).hexdigest()[:8]
+    return "{}-{}".format(os.path.basename(executable), digest)
+
+
+def _build_environment(env_path, executable):
+    if os.path.realpath(executable) == os.path.realpath(sys.executable):
+        create_venv(env_path, with_pip=True)
+    else:
+        subprocess.run([executable, "-m", "venv", env_path], check=True)
+
+
+class EnvironmentPool:
+    """Blank, ready-made environments per interpreter under ``~/.venvdir/pool``.
+
+    ``pool.cfg`` holds a default ``size`` for every interpreter, optional
+    per-interpreter ``target`` overrides and whether a claim should ``refill`` the
+    pool in the background. A size of 0, the default, disables the pool.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.config_path = os.path.join(directory, _CONFIG_FILE_NAME)
+        self.stats_path = os.path.join(directory, _STATS_FILE_NAME)
+        self._stats = JsonCache(self.stats_path)
+
+    def _read_config(self):
+        parser = ConfigParser()
+        parser.read(self.config_path)
+        if not parser.has_section(_POOL_SECTION):
+            parser.add_section(_POOL_SECTION)
+        return parser
+
+    def _write_config(self, parser):
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self.config_path, "w+", encoding="utf-8") as file:
+            parser.write(file)
+
+    @property
+    def size(self):
+        return self._read_config().getint(_POOL_SECTION, "size", fallback=0)
+
+    @property
+    def refill(self):
+        return self._read_config().getboolean(_POOL_SECTION, "refill", fallback=True)
+
+    def configure(self, size=None, refill=None, targets=None):
+        """Updates the default size, the refill flag and ``{key: target}`` overrides."""
+        parser = self._read_config()
+        if size is not None:
+            parser[_POOL_SECTION]["size"] = str(size)
+        if refill is not None:
+            parser[_POOL_SECTION]["refill"] = str(refill).lower()
+        for key, target in (targets or {}).items():
+            section = _INTERPRETER_SECTION.format(key)
+            if not parser.has_section(section):
+                parser.add_section(section)
+            parser[section]["target"] = str(target)
+        self._write_config(parser)
+
+    def get_target(self, key):
+        parser = self._read_config()
+        section = _INTERPRETER_SECTION.format(key)
+        default = parser.getint(_POOL_SECTION, "size", fallback=0)
+        return parser.getint(section, "target", fallback=default)
+
+    def get_keys(self):
+        """Interpreter keys that are configured or have environments in the pool."""
+        keys = {
+            section.split(":", 1)[1]
+            for section in self._read_config().sections()
+            if section.startswith(_INTERPRETER_SECTION.format(""))
+        }
+        if os.path.isdir(self.directory):
+            keys.update(e.name for e in os.scandir(self.directory) if e.is_dir())
+        keys.update(self._read_stats().keys())
+        return sorted(keys)
+
+    def get_ready(self, key):
+        """Paths of the finished environments waiting in the pool for ``key``."""
+        key_path = os.path.join(self.directory, key)
+        if not os.path.isdir(key_path):
+            return []
+        return sorted(
+            entry.path
+            for entry in os.scandir(key_path)
+            if entry.is_dir() and not entry.name.startswith(".")
+        )
+
+    def fill(self, executable=None):
+        """Builds environments until the pool for ``executable`` reaches its target.
+
+        Returns the number built, or ``None`` when another fill is already running.
+        """
+        executable = executable or sys.executable
+        key = get_interpreter_key(executable)
+        key_path = os.path.join(self.directory, key)
+        os.makedirs(key_path, exist_ok=True)
+        lock_path = os.path.join(key_path, _FILL_LOCK_FILE_NAME)
+        with file_lock(lock_path, blocking=False) as acquired:
+            if not acquired:
+                return None
+            built = 0
+            while len(self.get_ready(key)) < self.get_target(key):
+                token = uuid.uuid4().hex[:12]
+                building_path = os.path.join(key_path, ".building-{}".format(token))
+                ready_path = os.path.join(key_path, "env-{}".format(token))
+                _build_environment(building_path, executable)
+                relocate_environment(building_path, building_path, ready_path)
+                os.rename(building_path, ready_path)
+                built += 1
+            return built
+
+    def fill_in_background(self):
+        """Starts a detached ``venvdir pool fill`` process."""
+        subprocess.Popen(
+            [sys.executable, "-m", "venvdir", "pool", "fill"],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+
+    def claim(self, env_path, executable=None):
+        """Moves a pooled environment to ``env_path``.
+
+        Returns ``True`` on a hit. Returns ``False`` when the pool is empty or
+        disabled, or lives on another file system than ``env_path``.
+        """
+        key = get_interpreter_key(executable)
+        if not self.get_target(key):
+            return False
+
+        claimed = False
+        for pooled_path in self.get_ready(key):
+            try:
+                os.rename(pooled_path, env_path)
+            except FileNotFoundError:
+                # Another process claimed it first.
+                continue
+            except OSError as err:
+                if err.errno == errno.EXDEV:
+                    break
+                raise
+            relocate_environment(env_path, pooled_path)
+            claimed = True
+            break
+
+        self._record(key, "hits" if claimed else "misses")
+        if self.refill:
+            self.fill_in_background()
+        return claimed
+
+    def clear(self):
+        """Deletes every pooled environment. Returns how many were removed."""
+        removed = 0
+        for key in self.get_keys():
+            for pooled_path in self.get_ready(key):
+                shutil.rmtree(pooled_path, ignore_errors=True)
+                removed += 1
+        return removed
+
+    def get_stats(self):
+        """Rows of target, ready count, hits and misses per interpreter key."""
+        stats = self._read_stats()
+        rows = []
+        for key in self.get_keys():
+            key_stats = stats.get(key, {})
+            rows.append(
+                {
+                    "interpreter": key,
+                    "target": self.get_target(key),
+                    "ready": len(self.get_ready(key)),
+                    "hits": key_stats.get("hits", 0),
+                    "misses": key_stats.get("misses", 0),
+                }
+            )
+        return rows
+
+    def _read_stats(self):
+        return self._stats.load()
+
+    def _record(self, key, counter):
+        os.makedirs(self.directory, exist_ok=True)
+        with file_lock(self.stats_path + ".lock"):
+            stats = self._read_stats()
+            key_stats = stats.setdefault(key, {})
+            key_stats[counter] = key_stats.get(counter, 0) + 1
+            self._stats.save(stats)
+
+
+def get_pool():
+    return EnvironmentPool(get_user_project_path(_POOL_DIR_NAME))
@@ -0,0 +1,146 @@
+import glob
+import os
+from concurrent.futures import ThreadPoolExecutor
+from configparser import ConfigParser
+
+from venvdir.util import get_user_project_path
+from venvdir.util import JsonCache
+
+_CACHE_FILE_NAME = "envstats.json"
+STAT_FIELDS = ("size", "python", "mtime")
+
+
+def get_site_packages(env_path):
+    """Returns the ``site-packages`` directories of the environment at ``env_path``."""
+    patterns = [
+        os.path.join(env_path, "lib", "python*", "site-packages"),
+        os.path.join(env_path, "Lib", "site-packages"),
+    ]
+    return sorted(p for pattern in patterns for p in glob.glob(pattern))
+
+
+def read_pyvenv_cfg(env_path):
+    """Returns the keys of ``pyvenv.cfg`` as a dict, empty if it cannot be read."""
+    parser = ConfigParser()
+    try:
+        with open(os.path.join(env_path, "pyvenv.cfg"), encoding="utf-8") as file:
+            parser.read_string("[pyvenv]\n" + file.read())
+    except (OSError, ValueError):
+        return {}
+    return dict(parser["pyvenv"].items())
+
+
+def get_python_version(env_path):
+    pyvenv_cfg = read_pyvenv_cfg(env_path)
+    return pyvenv_cfg.get("version") or pyvenv_cfg.get("version_info")
+
+
+def get_signature(env_path):
+    """Modification times of the directories that change when an environment does.
+
+    The root changes with ``pyvenv.cfg``, ``bin`` with new scripts and each
+    ``site-packages`` with every install or uninstall.
+    """
+    paths = [env_path, os.path.join(env_path, "bin")] + get_site_packages(env_path)
+    signature = []
+    for path in paths:
+        try:
+            signature.append(os.stat(path).st_mtime_ns)
+        except OSError:
+            signature.append(None)
+    return signature
+
+
+def get_tree_size(root):
+    """Sums the sizes of the files under ``root`` without following symlinks.
+
+    Hardlinked files are counted once.
+    """
+    total = 0
+    seen_inodes = set()
+    stack = [root]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                        continue
+                    stat = entry.stat(follow_symlinks=False)
+                    if stat.st_nlink > 1:
+                        inode = (stat.st_dev, stat.st_ino)
+                        if inode in seen_inodes:
+                            continue
+                        seen_inodes.add(inode)
+                    total += stat.st_size
+        except OSError:
+            continue
+    return total
+
+
+def _compute_stats(env_path, fields):
+    stats = {}
+    if "size" in fields:
+        stats["size"] = get_tree_size(env_path)
+    if "python" in fields:
+        stats["python"] = get_python_version(env_path)
+    if "mtime" in fields:
+        mtimes = [m for m in get_signature(env_path) if m is not None]
+        stats["mtime"] = max(mtimes) / 1e9 if mtimes else None
+    return stats
+
+
+class EnvironmentStats:
+    """Per-environment size, Python version and modification time.
+
+    Results are kept in ``envstats.json`` together with the
+    :func:`get_signature` they were computed for, so only environments whose
+    directories changed since the last run get scanned again.
+    """
+
+    def __init__(self, cache_path):
+        self._cache = JsonCache(cache_path)
+
+    def collect(self, env_paths, fields=STAT_FIELDS, jobs=None):
+        """Returns ``{env_path: {field: value}}``, scanning stale paths in parallel."""
+        fields = set(fields)
+        cached = self._cache.load()
+        results = {}
+        stale = []
+        signatures = {}
+
+        def check(env_path):
+            return env_path, get_signature(env_path)
+
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            for env_path, signature in executor.map(check, env_paths):
+                signatures[env_path] = signature
+                item = cached.get(env_path)
+                if (
+                    item
+                    and item.get("signature") == signature
+                    and fields.issubset(item.get("stats", {}))
+                ):
+                    results[env_path] = item["stats"]
+                else:
+                    stale.append(env_path)
+
+            scanned = executor.map(lambda p: _compute_stats(p, fields), stale)
+            for env_path, stats in zip(stale, scanned):
+                item = cached.get(env_path)
+                if item and item.get("signature") == signatures[env_path]:
+                    stats = dict(item.get("stats", {}), **stats)
+                results[env_path] = stats
+
+        if stale or set(cached) - set(env_paths):
+            self._cache.save(
+                {
+                    env_path: {"signature": signatures[env_path], "stats": stats}
+                    for env_path, stats in results.items()
+                }
+            )
+        return results
+
+
+def get_environment_stats():
+    return EnvironmentStats(os.path.join(get_user_project_path(), _CACHE_FILE_NAME))
@@ -0,0 +1,92 @@
+import errno
+import os
+import shutil
+import subprocess
+import sys
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from venvdir.util import file_lock
+from venvdir.util import get_user_project_path
+
+_TRASH_DIR_NAME = "trash"
+_PURGE_LOCK_FILE_NAME = ".purge.lock"
+
+
+class Trash:
+    """Holding area under ``~/.venvdir/trash`` for environments waiting to be deleted.
+
+    Moving a tree here is a single rename, so ``rm`` returns right away. The actual
+    deletion happens in :meth:`purge`, which can be interrupted and run again.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def move(self, env_path):
+        """Renames ``env_path`` into the trash.
+
+        Returns ``False`` when the environment is on another file system and has to
+        be deleted in place instead.
+        """
+        if os.path.realpath(env_path) == os.path.expanduser("~"):
+            return False
+        os.makedirs(self.directory, exist_ok=True)
+        trash_name = "{}-{}".format(uuid.uuid4().hex[:12], os.path.basename(env_path))
+        try:
+            os.rename(env_path, os.path.join(self.directory, trash_name))
+        except FileNotFoundError:
+            # Already gone; there is nothing left to delete.
+            pass
+        except OSError as err:
+            if err.errno == errno.EXDEV:
+                return False
+            raise
+        return True
+
+    def get_items(self):
+        if not os.path.isdir(self.directory):
+            return []
+        return [
+            entry.path
+            for entry in os.scandir(self.directory)
+            if not entry.name.startswith(".")
+        ]
+
+    def purge(self, jobs=None):
+        """Deletes everything in the trash using a pool of threads.
+
+        Returns the number of trees deleted, or ``None`` when another purge is
+        already running.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        lock_path = os.path.join(self.directory, _PURGE_LOCK_FILE_NAME)
+        with file_lock(lock_path, blocking=False) as acquired:
+            if not acquired:
+                return None
+            items = self.get_items()
+            with ThreadPoolExecutor(max_workers=jobs) as executor:
+                list(executor.map(self._delete, items))
+            return len(items)
+
+    def purge_in_background(self):
+        """Starts a detached ``venvdir purge`` process."""
+        subprocess.Popen(
+            [sys.executable, "-m", "venvdir", "purge"],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+
+    @staticmethod
+    def _delete(item_path):
+        # Whatever cannot be deleted now stays in the trash for the next purge.
+        if os.path.isdir(item_path) and not os.path.islink(item_path):
+            shutil.rmtree(item_path, ignore_errors=True)
+        elif os.path.lexists(item_path):
+            os.remove(item_path)
+
+
+def get_trash():
+    return Trash(get_user_project_path(_TRASH_DIR_NAME))
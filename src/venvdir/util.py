@@ -1,9 +1,16 @@
+import itertools
+import json
 import shutil
-from collections import OrderedDict
+from contextlib import contextmanager
 import os
 from os import makedirs
 from os import path
 
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
 _PADDING_SIZE = 5
 
 
@@ -23,16 +30,31 @@ def get_default_venvs_path():
     return get_user_project_path("venvs")
 
 
-def format_to_table(rows, column_size):
-    """Formats given rows into a string of left justified table."""
+def format_size(size):
+    """Formats a byte count for humans, e.g. ``1.5G``."""
+    for unit in ["B", "K", "M", "G", "T"]:
+        if size < 1024 or unit == "T":
+            break
+        size /= 1024.0
+    if unit == "B":
+        return "{}B".format(int(size))
+    return "{:.1f}{}".format(size, unit)
+
+
+def format_to_table(rows, column_size, keep_order=False):
+    """Formats given rows into a string of left justified table.
+
+    Columns are sorted by key unless ``keep_order`` is set, in which case they
+    follow the key order of each row.
+    """
     lines = []
     for row in rows:
-        line = ""
-        keys = sorted(row.keys())
-        for key in keys:
-            key_lower = key.lower()
-            line += str(row[key_lower]).ljust(column_size[key_lower] + _PADDING_SIZE)
-        lines.append(line)
+        keys = row.keys() if keep_order else sorted(row.keys())
+        lines.append(
+            "".join(
+                str(row[key]).ljust(column_size[key] + _PADDING_SIZE) for key in keys
+            )
+        )
     return "\n".join(lines)
 
 
@@ -50,25 +72,88 @@ def find_format_width(record, header=None, include_header=True):
     Returns:
         tuple (list of dict, dict): i.e Filtered records, padding size of columns.
     """
-    rows = []
-    if include_header:
-        if not header:
-            header = _get_default_header(record)
-        rows.append(header)
-    max_width_item = dict(header.items())  # Copy
+    if not header:
+        header = _get_default_header(record)
+    keys = list(header.keys())
+    rows = [header] if include_header else []
+    column_size = {key: len(str(header[key])) for key in keys}
     for record_row in record:
-        row = OrderedDict()
-        for header_key in header.keys():
-            item = record_row.get(header_key)
-            row[header_key] = item
-            max_width_item[header_key] = max(
-                max_width_item[header_key], str(item), key=len
-            )
+        row = {key: record_row.get(key) for key in keys}
+        for key in keys:
+            width = len(str(row[key]))
+            if width > column_size[key]:
+                column_size[key] = width
         rows.append(row)
-    column_size = {key: len(value) for key, value in max_width_item.items()}
     return rows, column_size
 
 
+OUTPUT_FORMATS = ("table", "json", "ndjson", "tsv")
+
+
+def _iter_table_lines(records, header):
+    keys = list(header.keys())
+    widths = [len(str(header[key])) for key in keys]
+    cells = []
+    for record in records:
+        row = [str(record.get(key)) for key in keys]
+        for index, cell in enumerate(row):
+            if len(cell) > widths[index]:
+                widths[index] = len(cell)
+        cells.append(row)
+    if not cells:
+        return
+
+    widths = [width + _PADDING_SIZE for width in widths]
+    yield "".join(str(header[key]).ljust(w) for key, w in zip(keys, widths))
+    for row in cells:
+        yield "".join(cell.ljust(width) for cell, width in zip(row, widths))
+
+
+def _iter_json_lines(records, keys):
+    previous = None
+    yield "["
+    for record in records:
+        if previous is not None:
+            yield previous + ","
+        previous = json.dumps({key: record.get(key) for key in keys})
+    if previous is not None:
+        yield previous
+    yield "]"
+
+
+def _to_tsv_cell(value):
+    if value is None:
+        return ""
+    return str(value).replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n")
+
+
+def iter_formatted_lines(records, header, output_format="table"):
+    """Yields the output lines for ``records`` in one of :data:`OUTPUT_FORMATS`.
+
+    ``json``, ``ndjson`` and ``tsv`` emit each record as soon as it is read. The
+    table needs every row to size its columns, which it does in the same single
+    pass that converts the cells to strings.
+
+    Args:
+        records (iterable of dict): rows to output.
+        header (dict): keys to output mapped to the table column names.
+        output_format (str): one of :data:`OUTPUT_FORMATS`.
+    """
+    keys = list(header.keys())
+    if output_format == "table":
+        return _iter_table_lines(records, header)
+    if output_format == "json":
+        return _iter_json_lines(records, keys)
+    if output_format == "ndjson":
+        return (json.dumps({key: record.get(key) for key in keys}) for record in records)
+    if output_format == "tsv":
+        rows = (
+            "\t".join(_to_tsv_cell(record.get(key)) for key in keys) for record in records
+        )
+        return itertools.chain(["\t".join(keys)], rows)
+    raise ValueError("Unknown output format '{}'.".format(output_format))
+
+
 def _get_default_header(header_items):
     if not header_items:
         return
@@ -86,3 +171,88 @@ def _get_default_header(header_items):
 def remove_directory(path_to_remove):
     if path_to_remove != path.expanduser("~"):
         shutil.rmtree(path_to_remove)
+
+
+def atomic_write(file_path, text):
+    """Writes text to a hidden temp file next to ``file_path`` and renames it in place."""
+    directory, base_name = path.split(file_path)
+    tmp_path = path.join(directory, ".{}.{}.tmp".format(base_name, os.getpid()))
+    with open(tmp_path, "w", encoding="utf-8") as file:
+        file.write(text)
+    os.replace(tmp_path, file_path)
+
+
+@contextmanager
+def file_lock(lock_path, blocking=True):
+    """Holds an exclusive ``flock`` on ``lock_path`` for the duration of the block.
+
+    Yields ``False`` instead of waiting when ``blocking`` is off and another process
+    holds the lock. Locking is skipped on platforms without ``fcntl``.
+    """
+    with open(lock_path, "a") as lock_file:
+        if fcntl is None:
+            yield True
+            return
+        flags = fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB
+        try:
+            fcntl.flock(lock_file.fileno(), flags)
+        except BlockingIOError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def relocate_environment(env_path, old_path, new_path=None):
+    """Rewrites the absolute paths baked into the virtual environment at ``env_path``.
+
+    Occurrences of ``old_path`` become ``new_path``, which defaults to ``env_path``
+    for an environment that was already moved. Covers the activation scripts and
+    console-script shebangs in ``bin/`` plus ``pyvenv.cfg``, which are the places
+    ``venv`` and pip record the location.
+    """
+    new_path = new_path or env_path
+    old_name = path.basename(old_path.rstrip(os.sep))
+    new_name = path.basename(new_path.rstrip(os.sep))
+    replacements = [
+        (old_path.encode(), new_path.encode()),
+        ("({})".format(old_name).encode(), "({})".format(new_name).encode()),
+    ]
+    bin_path = path.join(env_path, "bin")
+    file_paths = [path.join(env_path, "pyvenv.cfg")]
+    if path.isdir(bin_path):
+        file_paths.extend(entry.path for entry in os.scandir(bin_path))
+    for file_path in file_paths:
+        if path.islink(file_path) or not path.isfile(file_path):
+            continue
+        with open(file_path, "rb") as file:
+            content = file.read()
+        if b"\0" in content[:1024]:
+            continue
+        new_content = content
+        for old, new in replacements:
+            new_content = new_content.replace(old, new)
+        if new_content != content:
+            with open(file_path, "wb") as file:
+                file.write(new_content)
+
+
+class JsonCache:
+    """A JSON document on disk that is read whole and replaced atomically."""
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+
+    def load(self):
+        try:
+            with open(self.file_path, encoding="utf-8") as file:
+                data = json.load(file)
+        except (FileNotFoundError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def save(self, data):
+        makedirs(path.dirname(self.file_path), exist_ok=True)
+        atomic_write(self.file_path, json.dumps(data, sort_keys=True))
@@ -1,9 +1,13 @@
 import os
+import time
+from concurrent.futures import ProcessPoolExecutor
 from venv import create as create_venv
 from os.path import exists as does_path_exist
 
 from venvdir.error import VenvDirBaseError
-from venvdir._configparser import config_parser
+from venvdir._registry import get_registry
+from venvdir.pool import get_pool
+from venvdir.trash import get_trash
 from venvdir.util import get_default_venvs_path
 from venvdir.util import remove_directory
 
@@ -48,12 +52,17 @@ class ManagedVirtualEnvironment:
         return "Virtual Env: (name={}, path={})".format(self.name, self.path)
 
 
+def iter_entries():
+    """Yields each entry as it is read from the registry, sorted by name."""
+    for name, entry in get_registry().iter_entries():
+        yield ManagedVirtualEnvironment(name, entry)
+
+
 def get_entries():
-    names = config_parser.entries
-    return [get_entry(name) for name in names]
+    return list(iter_entries())
 
 
-def create_entry(name, path=None):
+def _get_new_env_path(name, path):
     if not path:
         path = get_default_venvs_path()
     elif not does_path_exist(path):
@@ -64,22 +73,94 @@ def create_entry(name, path=None):
         raise VenvDirBaseError(
             "Virtual environment '{}' already exists.".format(env_path)
         )
-    create_venv(env_path, with_pip=True)
-    config_parser.create_entry(name, path)
+    return path, env_path
+
+
+def _build_environment(env_path):
+    start = time.monotonic()
+    if not get_pool().claim(env_path):
+        create_venv(env_path, with_pip=True)
+    return time.monotonic() - start
+
+
+def create_entry(name, path=None):
+    path, env_path = _get_new_env_path(name, path)
+    _build_environment(env_path)
+    get_registry().create_entry(name, path)
+
+
+class CreateResult:
+    def __init__(self, name, path, seconds=None, error=None):
+        self.name = name
+        self.path = path
+        self.seconds = seconds
+        self.error = error
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+def create_entries(items, jobs=None):
+    """Creates many environments concurrently and registers them in one commit.
+
+    Args:
+        items (list of tuple): ``(name, path)`` pairs as given to :func:`create_entry`.
+        jobs (int): maximum number of worker processes, defaults to the CPU count.
+
+    Returns:
+        list of CreateResult: one per item, in the given order. A failing item does
+        not stop the others.
+    """
+    results = []
+    pending = []
+    seen = set()
+    registry = get_registry()
+    for name, path in items:
+        try:
+            if name in seen or name in registry:
+                raise VenvDirBaseError("Entry '{}' already exists.".format(name))
+            seen.add(name)
+            path, env_path = _get_new_env_path(name, path)
+        except VenvDirBaseError as err:
+            results.append(CreateResult(name, path, error=str(err)))
+            continue
+        result = CreateResult(name, path)
+        results.append(result)
+        pending.append((result, env_path))
+
+    if pending:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            futures = [
+                (result, executor.submit(_build_environment, env_path))
+                for result, env_path in pending
+            ]
+            for result, future in futures:
+                try:
+                    result.seconds = future.result()
+                except Exception as err:
+                    result.error = str(err) or type(err).__name__
+
+    registry.create_entries([(r.name, r.path) for r, _ in pending if r.ok])
+    return results
 
 
 def add_entry(name, path):
     if not does_path_exist(path):
         raise VenvDirBaseError("Venv path '{}' does not exist.".format(path))
-    config_parser.create_entry(name, path)
+    get_registry().create_entry(name, path)
 
 
 def get_entry(name):
-    config_entry = config_parser.get_entry(name)
+    config_entry = get_registry().get_entry(name)
     return ManagedVirtualEnvironment(name, config_entry)
 
 
 def remove_entry(name):
     entry = get_entry(name)
-    remove_directory(entry.path)
-    config_parser.remove_entry(name)
+    get_registry().remove_entry(name)
+    trash = get_trash()
+    if trash.move(entry.path):
+        trash.purge_in_background()
+    else:
+        remove_directory(entry.path)
@@ -1,3 +1,5 @@
+import json
+
 import pytest
 
 from venvdir.main import cli
@@ -5,8 +7,8 @@ from venvdir.venvs import ManagedVirtualEnvironment
 
 
 @pytest.fixture
-def mock_get_entries(mocker):
-    return mocker.patch(_create_patch_str("get_entries"))
+def mock_iter_entries(mocker):
+    return mocker.patch(_create_patch_str("iter_entries"))
 
 
 @pytest.fixture
@@ -14,6 +16,11 @@ def mock_create_entry(mocker):
     return mocker.patch(_create_patch_str("create_entry"))
 
 
+@pytest.fixture
+def mock_create_entries(mocker):
+    return mocker.patch(_create_patch_str("create_entries"))
+
+
 @pytest.fixture
 def mock_add_entry(mocker):
     return mocker.patch(_create_patch_str("add_entry"))
@@ -34,22 +41,22 @@ def _create_patch_str(name):
     return "venvdir.main.{}".format(name)
 
 
-def test_ls_output_all_virtual_environments(runner, mock_get_entries):
+def test_ls_output_all_virtual_environments(runner, mock_iter_entries):
     entries = [
         ManagedVirtualEnvironment("name0", {"path": "path/to/name0"}),
         ManagedVirtualEnvironment("name1", {"path": "path/to/name1"}),
         ManagedVirtualEnvironment("name2", {"path": "path/to/name2"})
     ]
-    mock_get_entries.return_value = entries
+    mock_iter_entries.return_value = entries
     res = runner.invoke(cli, "ls")
     for entry in entries:
         assert entry.name in res.output
         assert entry.path in res.output
-    assert mock_get_entries.call_count == 1
+    assert mock_iter_entries.call_count == 1
 
 
-def test_ls_when_no_entries_outputs_nothing(runner, mock_get_entries):
-    mock_get_entries.return_value = []
+def test_ls_when_no_entries_outputs_nothing(runner, mock_iter_entries):
+    mock_iter_entries.return_value = []
     res = runner.invoke(cli, "ls")
     assert res.output == ""
 
@@ -64,6 +71,26 @@ def test_create_calls_create_with_path(runner, mock_create_entry):
     mock_create_entry.assert_called_once_with("test", "path")
 
 
+def test_create_requires_name_or_manifest(runner, mock_create_entry):
+    res = runner.invoke(cli, "create")
+    assert "Provide either NAME or --from-manifest." in res.output
+    assert not mock_create_entry.call_count
+
+
+def test_create_from_manifest_calls_create_entries(
+    runner, mock_create_entries, tmp_path
+):
+    manifest_path = tmp_path / "envs.json"
+    manifest_path.write_text('{"envs": {"a": {}, "b": {"path": "other"}}}')
+    mock_create_entries.return_value = []
+    runner.invoke(
+        cli, ["create", "--from-manifest", str(manifest_path), "-p", "base", "-j", "2"]
+    )
+    mock_create_entries.assert_called_once_with(
+        [("a", "base"), ("b", "other")], jobs=2
+    )
+
+
 def test_add_requires_path(runner, mock_add_entry):
     res = runner.invoke(cli, "add test")
     assert "usage" in res.output.lower()
@@ -84,4 +111,63 @@ def test_which_outputs_expected_path(runner, mock_get_entry):
         "test", {"path": "path/to/test"}
     )
     res = runner.invoke(cli, "which test")
-    assert "path/to/test" in res.output
\ No newline at end of file
+    assert "path/to/test" in res.output
+
+def test_pool_config_with_bad_target_shows_usage(runner):
+    res = runner.invoke(cli, "pool config --target nope")
+    assert "KEY=N" in res.output
+
+
+def test_ls_with_size_sorts_largest_first(runner, mock_iter_entries, mocker):
+    mock_iter_entries.return_value = [
+        ManagedVirtualEnvironment("small", {"path": "path/to/small"}),
+        ManagedVirtualEnvironment("large", {"path": "path/to/large"}),
+    ]
+    mock_stats = mocker.patch(_create_patch_str("get_environment_stats")).return_value
+    mock_stats.collect.return_value = {
+        "path/to/small": {"size": 10},
+        "path/to/large": {"size": 2048},
+    }
+    res = runner.invoke(cli, "ls --size --sort size")
+    lines = res.output.splitlines()
+    assert lines[0].split() == ["Name", "Path", "Size"]
+    assert lines[1].split() == ["large", "path/to/large", "2.0K"]
+    assert lines[2].split() == ["small", "path/to/small", "10B"]
+
+
+def test_ls_format_ndjson_outputs_one_object_per_entry(runner, mock_iter_entries):
+    mock_iter_entries.return_value = [
+        ManagedVirtualEnvironment("name0", {"path": "path/to/name0"}),
+        ManagedVirtualEnvironment("name1", {"path": "path/to/name1"}),
+    ]
+    res = runner.invoke(cli, "ls --format ndjson")
+    assert res.output.splitlines() == [
+        '{"name": "name0", "path": "path/to/name0"}',
+        '{"name": "name1", "path": "path/to/name1"}',
+    ]
+
+
+def test_ls_format_json_outputs_array(runner, mock_iter_entries):
+    mock_iter_entries.return_value = [
+        ManagedVirtualEnvironment("name0", {"path": "path/to/name0"}),
+        ManagedVirtualEnvironment("name1", {"path": "path/to/name1"}),
+    ]
+    res = runner.invoke(cli, "ls --format json")
+    assert json.loads(res.output) == [
+        {"name": "name0", "path": "path/to/name0"},
+        {"name": "name1", "path": "path/to/name1"},
+    ]
+
+
+def test_ls_format_json_when_no_entries_outputs_empty_array(runner, mock_iter_entries):
+    mock_iter_entries.return_value = []
+    res = runner.invoke(cli, "ls --format json")
+    assert json.loads(res.output) == []
+
+
+def test_ls_format_tsv_outputs_header_and_rows(runner, mock_iter_entries):
+    mock_iter_entries.return_value = [
+        ManagedVirtualEnvironment("name0", {"path": "path/with\ttab"}),
+    ]
+    res = runner.invoke(cli, "ls --format tsv")
+    assert res.output.splitlines() == ["name\tpath", "name0\tpath/with\\ttab"]
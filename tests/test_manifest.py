@@ -0,0 +1,45 @@
+import pytest
+
+from venvdir.error import VenvDirBaseError
+from venvdir.manifest import load_manifest
+
+
+def _write(tmp_path, file_name, content):
+    manifest_path = tmp_path / file_name
+    manifest_path.write_text(content)
+    return str(manifest_path)
+
+
+def test_load_manifest_reads_toml(tmp_path):
+    manifest_path = _write(
+        tmp_path, "envs.toml", '[envs.api]\npath = "/srv"\n\n[envs.web]\n'
+    )
+    assert load_manifest(manifest_path) == [("api", "/srv"), ("web", None)]
+
+
+def test_load_manifest_reads_json(tmp_path):
+    manifest_path = _write(
+        tmp_path, "envs.json", '{"envs": {"api": {"path": "/srv"}, "web": {}}}'
+    )
+    assert load_manifest(manifest_path) == [("api", "/srv"), ("web", None)]
+
+
+def test_load_manifest_reads_ini(tmp_path):
+    manifest_path = _write(tmp_path, "envs.ini", "[api]\npath = /srv\n\n[web]\n")
+    assert load_manifest(manifest_path) == [("api", "/srv"), ("web", None)]
+
+
+def test_load_manifest_when_unknown_extension_raises_error(tmp_path):
+    manifest_path = _write(tmp_path, "envs.yaml", "")
+    with pytest.raises(VenvDirBaseError) as err:
+        load_manifest(manifest_path)
+
+    assert "Unsupported manifest" in str(err.value)
+
+
+def test_load_manifest_when_malformed_raises_error(tmp_path):
+    manifest_path = _write(tmp_path, "envs.json", '{"envs": {"api": "/srv"}}')
+    with pytest.raises(VenvDirBaseError) as err:
+        load_manifest(manifest_path)
+
+    assert "must map environment names" in str(err.value)
@@ -0,0 +1,77 @@
+import os
+
+import pytest
+
+from venvdir.pool import EnvironmentPool
+from venvdir.pool import get_interpreter_key
+
+
+@pytest.fixture
+def pool(tmp_path):
+    return EnvironmentPool(str(tmp_path / "pool"))
+
+
+@pytest.fixture(autouse=True)
+def mock_build(mocker):
+    def build_side_effect(env_path, executable):
+        os.makedirs(os.path.join(env_path, "bin"))
+        with open(os.path.join(env_path, "bin", "activate"), "w") as file:
+            file.write('VIRTUAL_ENV="{0}"\nPS1="({1}) "\n'.format(
+                env_path, os.path.basename(env_path)
+            ))
+
+    return mocker.patch("venvdir.pool._build_environment", side_effect=build_side_effect)
+
+
+@pytest.fixture(autouse=True)
+def mock_background_fill(mocker):
+    return mocker.patch("venvdir.pool.EnvironmentPool.fill_in_background")
+
+
+class TestEnvironmentPool:
+    def test_fill_when_disabled_builds_nothing(self, pool, mock_build):
+        assert pool.fill() == 0
+        assert not mock_build.call_count
+
+    def test_fill_builds_up_to_target(self, pool):
+        pool.configure(size=2)
+        assert pool.fill() == 2
+        assert pool.fill() == 0
+        assert len(pool.get_ready(get_interpreter_key())) == 2
+
+    def test_interpreter_target_overrides_size(self, pool):
+        key = get_interpreter_key()
+        pool.configure(size=1, targets={key: 3})
+        assert pool.get_target(key) == 3
+        assert pool.get_target("other") == 1
+
+    def test_claim_when_disabled_returns_false(self, pool, tmp_path):
+        assert not pool.claim(str(tmp_path / "env"))
+        assert pool.get_stats() == []
+
+    def test_claim_moves_and_relocates_environment(self, pool, tmp_path):
+        pool.configure(size=1)
+        pool.fill()
+        env_path = str(tmp_path / "myenv")
+        assert pool.claim(env_path)
+        with open(os.path.join(env_path, "bin", "activate")) as file:
+            content = file.read()
+        assert content == 'VIRTUAL_ENV="{}"\nPS1="(myenv) "\n'.format(env_path)
+        assert pool.get_ready(get_interpreter_key()) == []
+
+    def test_claim_records_hits_and_misses(self, pool, tmp_path, mock_background_fill):
+        pool.configure(size=1)
+        pool.fill()
+        pool.claim(str(tmp_path / "env0"))
+        pool.claim(str(tmp_path / "env1"))
+        stats = pool.get_stats()[0]
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert mock_background_fill.call_count == 2
+
+    def test_claim_when_refill_disabled_does_not_refill(
+        self, pool, tmp_path, mock_background_fill
+    ):
+        pool.configure(size=1, refill=False)
+        pool.claim(str(tmp_path / "env"))
+        assert not mock_background_fill.call_count
@@ -0,0 +1,145 @@
+import os
+
+import pytest
+
+from venvdir.error import VenvDirBaseError
+from venvdir._registry import JournaledRegistry
+
+TEST_BASE_PATH = "base/path"
+
+
+@pytest.fixture
+def registry(tmp_path):
+    return JournaledRegistry(str(tmp_path))
+
+
+def _journal_lines(directory):
+    names = [n for n in os.listdir(directory) if n.startswith("entries.journal")]
+    lines = []
+    for name in names:
+        with open(os.path.join(directory, name)) as file:
+            lines.extend(file.readlines())
+    return lines
+
+
+class TestJournaledRegistry:
+    def test_create_entry_then_get_entry_returns_entry(self, registry):
+        registry.create_entry("test", TEST_BASE_PATH)
+        assert registry.get_entry("test") == {"path": "base/path/test"}
+
+    def test_get_entry_when_does_not_exist_raises_error(self, registry):
+        with pytest.raises(VenvDirBaseError) as err:
+            registry.get_entry("test")
+
+        assert str(err.value) == "Entry 'test' does not exist."
+
+    def test_create_entry_when_exists_raises_error(self, registry):
+        registry.create_entry("test", TEST_BASE_PATH)
+        with pytest.raises(VenvDirBaseError) as err:
+            registry.create_entry("test", TEST_BASE_PATH)
+
+        assert str(err.value) == "Entry 'test' already exists."
+
+    def test_create_entry_appends_single_journal_line(self, registry, tmp_path):
+        registry.create_entry("test0", TEST_BASE_PATH)
+        registry.create_entry("test1", TEST_BASE_PATH)
+        assert len(_journal_lines(str(tmp_path))) == 2
+
+    def test_remove_entry_removes_entry(self, registry):
+        registry.create_entry("test", TEST_BASE_PATH)
+        registry.remove_entry("test")
+        assert registry.entries == []
+
+    def test_entries_are_sorted_across_snapshot_and_journal(self, tmp_path):
+        registry = JournaledRegistry(str(tmp_path), compact_threshold=2)
+        for name in ["c", "a", "e"]:
+            registry.create_entry(name, TEST_BASE_PATH)
+        registry.create_entry("b", TEST_BASE_PATH)
+        registry.create_entry("d", TEST_BASE_PATH)
+        assert registry.entries == ["a", "b", "c", "d", "e"]
+
+    def test_compacts_when_journal_exceeds_threshold(self, tmp_path):
+        registry = JournaledRegistry(str(tmp_path), compact_threshold=3)
+        for i in range(10):
+            registry.create_entry("test{}".format(i), TEST_BASE_PATH)
+        assert len(_journal_lines(str(tmp_path))) <= 3
+        for i in range(10):
+            assert registry.get_entry("test{}".format(i))
+
+    def test_state_survives_reload(self, tmp_path):
+        registry = JournaledRegistry(str(tmp_path), compact_threshold=4)
+        for i in range(10):
+            registry.create_entry("test{}".format(i), TEST_BASE_PATH)
+        registry.remove_entry("test3")
+        reloaded = JournaledRegistry(str(tmp_path))
+        assert reloaded.entries == registry.entries
+        assert "test3" not in reloaded.entries
+
+    def test_ignores_torn_journal_line(self, registry, tmp_path):
+        registry.create_entry("test", TEST_BASE_PATH)
+        with open(str(tmp_path / "entries.journal.0"), "a") as file:
+            file.write('{"op": "set", "name": "bro')
+        reloaded = JournaledRegistry(str(tmp_path))
+        assert reloaded.entries == ["test"]
+
+    def test_imports_legacy_entries_cfg(self, tmp_path):
+        with open(str(tmp_path / "entries.cfg"), "w") as file:
+            file.write("[legacy]\npath = legacy/path\n")
+        registry = JournaledRegistry(str(tmp_path))
+        assert registry.get_entry("legacy") == {"path": "legacy/path"}
+
+    def test_create_entry_writes_shell_path_file(self, registry, tmp_path):
+        registry.create_entry("test", TEST_BASE_PATH)
+        with open(str(tmp_path / "paths" / "test")) as file:
+            assert file.read() == "base/path/test\n"
+
+    def test_remove_entry_removes_shell_path_file(self, registry, tmp_path):
+        registry.create_entry("test", TEST_BASE_PATH)
+        registry.remove_entry("test")
+        assert not os.path.exists(str(tmp_path / "paths" / "test"))
+
+    def test_legacy_import_populates_shell_path_files(self, tmp_path):
+        with open(str(tmp_path / "entries.cfg"), "w") as file:
+            file.write("[legacy]\npath = legacy/path\n")
+        assert JournaledRegistry(str(tmp_path)).entries == ["legacy"]
+        assert os.listdir(str(tmp_path / "paths")) == ["legacy"]
+
+    def test_does_not_touch_disk_until_first_access(self, tmp_path):
+        directory = tmp_path / "registry"
+        JournaledRegistry(str(directory))
+        assert not directory.exists()
+
+    def test_sees_changes_from_another_instance(self, registry, tmp_path):
+        assert registry.entries == []
+        other = JournaledRegistry(str(tmp_path))
+        other.create_entry("test", TEST_BASE_PATH)
+        assert registry.entries == ["test"]
+
+    def test_sees_compaction_from_another_instance(self, registry, tmp_path):
+        assert registry.entries == []
+        other = JournaledRegistry(str(tmp_path), compact_threshold=1)
+        for i in range(5):
+            other.create_entry("test{}".format(i), TEST_BASE_PATH)
+        assert registry.get_entry("test4") == {"path": "base/path/test4"}
+        assert len(registry.entries) == 5
+
+    def test_cached_does_not_check_disk(self, registry, tmp_path, mocker):
+        registry.create_entry("test", TEST_BASE_PATH)
+        spy = mocker.spy(os, "stat")
+        with registry.cached():
+            spy.reset_mock()
+            for _ in range(10):
+                registry.get_entry("test")
+        assert not spy.call_count
+
+    def test_create_entries_writes_one_journal_append(self, registry, tmp_path, mocker):
+        spy = mocker.spy(registry, "_append")
+        registry.create_entries([("a", TEST_BASE_PATH), ("b", None)])
+        assert spy.call_count == 1
+        assert registry.entries == ["a", "b"]
+
+    def test_create_entries_when_duplicate_raises_error(self, registry):
+        with pytest.raises(VenvDirBaseError):
+            registry.create_entries([("a", TEST_BASE_PATH), ("a", TEST_BASE_PATH)])
+
+        assert registry.entries == []
@@ -0,0 +1,61 @@
+import os
+
+import pytest
+
+from venvdir.stats import EnvironmentStats
+from venvdir.stats import get_python_version
+from venvdir.stats import get_tree_size
+
+
+def _make_env(root, version="3.8.5"):
+    site_packages = os.path.join(root, "lib", "python3.8", "site-packages")
+    os.makedirs(site_packages)
+    os.makedirs(os.path.join(root, "bin"))
+    with open(os.path.join(root, "pyvenv.cfg"), "w") as file:
+        file.write("home = /usr/bin\nversion = {}\n".format(version))
+    with open(os.path.join(site_packages, "mod.py"), "w") as file:
+        file.write("x" * 100)
+    return root
+
+
+@pytest.fixture
+def env_stats(tmp_path):
+    return EnvironmentStats(str(tmp_path / "envstats.json"))
+
+
+def test_get_tree_size_counts_hardlinks_once(tmp_path):
+    root = _make_env(str(tmp_path / "env"))
+    size = get_tree_size(root)
+    source = os.path.join(root, "lib", "python3.8", "site-packages", "mod.py")
+    os.link(source, os.path.join(root, "bin", "linked.py"))
+    assert get_tree_size(root) == size
+
+
+def test_get_python_version_reads_pyvenv_cfg(tmp_path):
+    root = _make_env(str(tmp_path / "env"), version="3.7.1")
+    assert get_python_version(root) == "3.7.1"
+
+
+class TestEnvironmentStats:
+    def test_collect_returns_requested_fields(self, env_stats, tmp_path):
+        root = _make_env(str(tmp_path / "env"))
+        stats = env_stats.collect([root], fields=["size", "python"])[root]
+        assert stats["python"] == "3.8.5"
+        assert stats["size"] >= 100
+
+    def test_collect_reuses_cache_when_unchanged(self, env_stats, tmp_path, mocker):
+        root = _make_env(str(tmp_path / "env"))
+        env_stats.collect([root], fields=["size"])
+        scan = mocker.patch("venvdir.stats.get_tree_size")
+        env_stats.collect([root], fields=["size"])
+        assert not scan.call_count
+
+    def test_collect_rescans_when_site_packages_changes(self, env_stats, tmp_path):
+        root = _make_env(str(tmp_path / "env"))
+        before = env_stats.collect([root], fields=["size"])[root]["size"]
+        site_packages = os.path.join(root, "lib", "python3.8", "site-packages")
+        with open(os.path.join(site_packages, "new.py"), "w") as file:
+            file.write("y" * 1000)
+        os.utime(site_packages, ns=(0, 1))
+        after = env_stats.collect([root], fields=["size"])[root]["size"]
+        assert after == before + 1000
@@ -0,0 +1,50 @@
+import errno
+import os
+
+import pytest
+
+from venvdir.trash import Trash
+
+
+@pytest.fixture
+def trash(tmp_path):
+    return Trash(str(tmp_path / "trash"))
+
+
+def _make_tree(root):
+    os.makedirs(os.path.join(root, "lib", "site-packages"))
+    with open(os.path.join(root, "lib", "site-packages", "mod.py"), "w") as file:
+        file.write("")
+    return root
+
+
+class TestTrash:
+    def test_move_renames_environment_into_trash(self, trash, tmp_path):
+        env_path = _make_tree(str(tmp_path / "env"))
+        assert trash.move(env_path)
+        assert not os.path.exists(env_path)
+        items = trash.get_items()
+        assert len(items) == 1
+        assert items[0].endswith("-env")
+
+    def test_move_when_already_gone_succeeds(self, trash, tmp_path):
+        assert trash.move(str(tmp_path / "missing"))
+        assert trash.get_items() == []
+
+    def test_move_when_on_other_device_returns_false(self, trash, tmp_path, mocker):
+        env_path = _make_tree(str(tmp_path / "env"))
+        mocker.patch("venvdir.trash.os.rename", side_effect=OSError(errno.EXDEV, ""))
+        assert not trash.move(env_path)
+
+    def test_purge_deletes_every_item(self, trash, tmp_path):
+        for name in ["env0", "env1", "env2"]:
+            trash.move(_make_tree(str(tmp_path / name)))
+        assert trash.purge(jobs=2) == 3
+        assert trash.get_items() == []
+
+    def test_purge_resumes_partially_deleted_tree(self, trash, tmp_path):
+        trash.move(_make_tree(str(tmp_path / "env")))
+        item = trash.get_items()[0]
+        os.remove(os.path.join(item, "lib", "site-packages", "mod.py"))
+        assert trash.purge() == 1
+        assert trash.get_items() == []
@@ -1,7 +1,10 @@
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 
 from venvdir.error import VenvDirBaseError
 from venvdir.venvs import add_entry
+from venvdir.venvs import create_entries
 from venvdir.venvs import create_entry
 from venvdir.venvs import get_entries
 from venvdir.venvs import get_entry
@@ -16,7 +19,7 @@ TEST_DEFAULT_PATH = "default/path"
 
 @pytest.fixture()
 def mock_config_parser(mocker):
-    return mocker.patch(_create_patch_str("config_parser"))
+    return mocker.patch(_create_patch_str("get_registry")).return_value
 
 
 @pytest.fixture(autouse=True)
@@ -29,6 +32,20 @@ def venv_creator(mocker):
     return mocker.patch(_create_patch_str("create_venv"))
 
 
+@pytest.fixture(autouse=True)
+def mock_pool(mocker):
+    mock = mocker.patch(_create_patch_str("get_pool")).return_value
+    mock.claim.return_value = False
+    return mock
+
+
+@pytest.fixture(autouse=True)
+def mock_trash(mocker):
+    mock = mocker.patch(_create_patch_str("get_trash")).return_value
+    mock.move.return_value = False
+    return mock
+
+
 @pytest.fixture(autouse=True)
 def mock_path_existence(mocker):
     return mocker.patch(_create_patch_str("does_path_exist"))
@@ -72,18 +89,9 @@ class TestManagedVirtualEnvironment:
 def test_get_entries_returns_expected_entries(mock_config_parser):
     names = ["testname_0", "testname_1", "testname_2"]
     paths = ["test/path/0", "test/path/1", "test/path/2"]
-    sections = [
-        MockSection(names[0], {"path": paths[0]}),
-        MockSection(names[1], {"path": paths[1]}),
-        MockSection(names[2], {"path": paths[2]})
-    ]
-
-    def get_section_side_effect(name):
-        index = int(name[-1])
-        return sections[index]
-
-    mock_config_parser.entries = names
-    mock_config_parser.get_entry.side_effect = get_section_side_effect
+    mock_config_parser.iter_entries.return_value = iter(
+        [(name, {"path": path}) for name, path in zip(names, paths)]
+    )
 
     entries = get_entries()
 
@@ -106,6 +114,19 @@ def test_create_entry_when_not_given_path_uses_default_path(
     mock_config_parser.create_entry.assert_called_once_with(TEST_NAME, TEST_DEFAULT_PATH)
 
 
+def test_create_entry_when_pool_hit_does_not_create_venv(
+    mock_config_parser, mock_default_venv_path, venv_creator, mock_path_existence,
+    mock_pool
+):
+    mock_path_existence.return_value = False
+    mock_default_venv_path.return_value = TEST_DEFAULT_PATH
+    mock_pool.claim.return_value = True
+    create_entry(TEST_NAME)
+    mock_pool.claim.assert_called_once_with("{}/{}".format(TEST_DEFAULT_PATH, TEST_NAME))
+    assert not venv_creator.call_count
+    mock_config_parser.create_entry.assert_called_once_with(TEST_NAME, TEST_DEFAULT_PATH)
+
+
 def test_create_entry_when_environment_already_exists_raises_error(
     mock_config_parser, mock_default_venv_path, venv_creator, mock_path_existence
 ):
@@ -199,3 +220,54 @@ def test_remove_entry_removes_expected_entry_from_config(
     mock_config_parser.get_entry.side_effect = get_section_side_effect
     remove_entry(TEST_NAME)
     mock_config_parser.remove_entry.assert_called_once_with(TEST_NAME)
+
+
+def test_create_entries_builds_in_executor_and_registers_once(
+    mocker, mock_config_parser, mock_default_venv_path, venv_creator,
+    mock_path_existence
+):
+    mocker.patch(_create_patch_str("ProcessPoolExecutor"), ThreadPoolExecutor)
+    mock_path_existence.return_value = False
+    mock_default_venv_path.return_value = TEST_DEFAULT_PATH
+    mock_config_parser.__contains__.return_value = False
+    results = create_entries([("a", None), ("b", None)], jobs=2)
+    assert [r.ok for r in results] == [True, True]
+    assert venv_creator.call_count == 2
+    mock_config_parser.create_entries.assert_called_once_with(
+        [("a", TEST_DEFAULT_PATH), ("b", TEST_DEFAULT_PATH)]
+    )
+
+
+def test_create_entries_reports_failures_without_stopping_batch(
+    mocker, mock_config_parser, mock_default_venv_path, venv_creator,
+    mock_path_existence
+):
+    mocker.patch(_create_patch_str("ProcessPoolExecutor"), ThreadPoolExecutor)
+    mock_path_existence.return_value = False
+    mock_default_venv_path.return_value = TEST_DEFAULT_PATH
+    mock_config_parser.__contains__.side_effect = lambda name: name == "taken"
+
+    def create_venv_side_effect(env_path, with_pip):
+        if env_path.endswith("broken"):
+            raise OSError("disk full")
+
+    venv_creator.side_effect = create_venv_side_effect
+    results = create_entries([("taken", None), ("broken", None), ("ok", None)])
+    assert results[0].error == "Entry 'taken' already exists."
+    assert results[1].error == "disk full"
+    assert results[2].ok
+    mock_config_parser.create_entries.assert_called_once_with(
+        [("ok", TEST_DEFAULT_PATH)]
+    )
+
+
+def test_remove_entry_when_trash_accepts_directory_purges_in_background(
+    mock_config_parser, mock_remove_dir, mock_trash
+):
+    mock_config_parser.get_entry.return_value = {"path": TEST_GIVEN_PATH}
+    mock_trash.move.return_value = True
+    remove_entry(TEST_NAME)
+    mock_trash.move.assert_called_once_with(TEST_GIVEN_PATH)
+    assert mock_trash.purge_in_background.call_count == 1
+    assert not mock_remove_dir.call_count
+    mock_config_parser.remove_entry.assert_called_once_with(TEST_NAME)